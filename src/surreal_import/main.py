@@ -1,13 +1,44 @@
-import json
+import asyncio
+import concurrent.futures
 import ijson  # Import the streaming JSON library
 import logging
+import mmap
+import multiprocessing
+import operator
+import os
+import orjson  # Fast C JSON parser for line-delimited input
+import random
+import re
+import reprlib
 from rich.logging import RichHandler
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn, TaskProgressColumn
-from surrealdb import Surreal  # Import the Surreal class
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any
+from surrealdb import AsyncSurreal  # Import the async Surreal client
+from typing import List, Dict, Any, Iterator, Tuple
 
-num_core = 32
+try:
+    import uvloop  # libuv event loop; noticeably faster for WS-heavy workloads
+except ImportError:
+    uvloop = None
+
+try:
+    from websockets.exceptions import ConnectionClosed
+    CONNECTION_ERRORS = (ConnectionError, OSError, ConnectionClosed)
+except ImportError:
+    CONNECTION_ERRORS = (ConnectionError, OSError)
+
+num_core = int(os.environ.get('POOL_SIZE', '32'))  # Number of pooled connections / worker coroutines
+
+# Prefer the C backend — roughly an order of magnitude faster than the
+# pure-Python parser — then the cffi and plain yajl bindings, before
+# settling for whatever default ijson picked.
+for _backend_name in ('yajl2_c', 'yajl2_cffi', 'yajl2'):
+    try:
+        ijson_backend = ijson.get_backend(_backend_name)
+        break
+    except ImportError:
+        continue
+else:
+    ijson_backend = ijson.get_backend(ijson.backend)
 
 # --- Logging Setup ---
 logging.basicConfig(
@@ -20,97 +51,896 @@ log = logging.getLogger("rich")
 # --- End Logging Setup ---
 
 # --- Global Configuration ---
-LOG_EVERY_N_RECORDS = 1000  # Log after every 100 records
+BATCH_SIZE = int(os.environ.get('BATCH_SIZE', '1000'))  # Records per bulk insert call
+MIN_SPLIT_SIZE = 16  # Below this, a failed batch retries record-by-record instead of splitting
+MAX_INSERT_RETRIES = 3  # Attempts per batch (with backoff) before a failure counts as deterministic
+READ_BUFFER_SIZE = 1 << 20  # 1 MiB reads instead of the 8 KiB default
+IJSON_BUF_SIZE = 1 << 16  # 64 KiB per parser feed; bigger buys nothing, smaller multiplies FFI calls
+PARSE_PROCESSES = int(os.environ.get('PARSE_PROCESSES', '1'))  # Parser processes for sharded input
+SCAN_CHUNK_SIZE = 1 << 24  # 16 MiB chunks for the array boundary pre-pass
+HEARTBEAT_INTERVAL = 30.0  # Seconds between keepalive pings on idle pooled connections
+PRODUCER_POLL_INTERVAL = 5.0  # Seconds the producer blocks on a full queue before re-checking worker liveness
+# Bounded record repr for error logs: walks only the first few keys and
+# truncates long strings, instead of materializing a full repr of a
+# potentially huge record just to show a snippet. Only ever called on
+# the error path.
+RECORD_REPR = reprlib.Repr()
+RECORD_REPR.maxdict = 4
+RECORD_REPR.maxstring = 80
+# Optional projection: comma-separated field names, e.g.
+# PROJECT_FIELDS=id,title,authors,abstract,categories,update_date.
+# Empty means records are imported whole.
+PROJECT_FIELDS = tuple(f for f in os.environ.get('PROJECT_FIELDS', '').split(',') if f)
 # --- End Configuration ---
 
-def insert_record(database_url: str, namespace: str, database: str, table_name: str, record: Dict[str, Any], record_number: int) -> bool:
+
+def advise_sequential(f: Any, offset: int = 0, length: int = 0):
+    """
+    Hints the kernel that the file will be read front to back.
+
+    Sequential advice makes read-ahead aggressive and lets pages behind
+    the cursor be dropped early — it matters on cold-cache runs over
+    multi-GB dumps. No-op where posix_fadvise is unavailable.
+
+    Args:
+        f (Any): A binary file object.
+        offset (int): The start of the byte range the advice covers.
+        length (int): The range length; 0 means to the end of the file.
+    """
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(f.fileno(), offset, length, os.POSIX_FADV_SEQUENTIAL)
+
+
+def advise_done(f: Any, offset: int = 0, length: int = 0):
+    """
+    Tells the kernel the file's pages are no longer needed.
+
+    Frees the page cache after a one-shot import so the rest of the
+    system is not squeezed by gigabytes of dead cache.
+
+    Args:
+        f (Any): A binary file object.
+        offset (int): The start of the byte range the advice covers.
+        length (int): The range length; 0 means to the end of the file.
+    """
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(f.fileno(), offset, length, os.POSIX_FADV_DONTNEED)
+
+
+def sniff_is_array(f: Any) -> bool:
+    """
+    Peeks the first non-whitespace byte to detect the input format.
+
+    A leading '[' means a single JSON array; anything else is treated as
+    JSON Lines. This avoids the wasteful parse-the-whole-file-then-retry
+    approach to format detection. The file position is rewound.
+
+    Args:
+        f (Any): A binary file object positioned at the start.
+
+    Returns:
+        bool: True if the file holds a single JSON array.
+    """
+    first = f.read(1)
+    while first and first.isspace():
+        first = f.read(1)
+    f.seek(0)
+    return first == b'['
+
+
+def iter_records(file_path: str) -> Iterator[Any]:
+    """
+    Yields records from the input file, choosing a parser by content.
+
+    JSON Lines input is decoded line-by-line with orjson, which is much
+    faster than a streaming parse; a single JSON array is memory-mapped
+    and streamed with ijson so the kernel pages data in on demand
+    instead of the file being copied into a Python buffer.
+
+    Args:
+        file_path (str): The path to the input file.
+
+    Yields:
+        Any: Each parsed element of the input.
+    """
+    with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        if not sniff_is_array(f):
+            advise_sequential(f)
+            for line in f:
+                # isspace() bails on the first non-blank byte; unlike
+                # strip() it never copies the (potentially huge) line.
+                if not line.isspace():
+                    yield orjson.loads(line)
+            advise_done(f)
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, 'madvise'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)  # Hint aggressive read-ahead
+                # use_float keeps numbers as plain floats; the driver's CBOR
+                # encoder handles them natively instead of tagging Decimals.
+                # One parser instance serves the whole file, fed 64 KiB at
+                # a time straight off the map.
+                yield from ijson_backend.items(mm, 'item', use_float=True, buf_size=IJSON_BUF_SIZE)  # 'item' targets each element in the array
+
+
+def iter_records_slice(file_path: str, start: int, end: int) -> Iterator[Any]:
+    """
+    Yields JSON Lines records from a byte range of the input file.
+
+    A line belongs to the slice that contains its first byte; a worker
+    whose slice starts mid-line skips forward to the next line, and the
+    neighbouring worker finishes the straddling line, so every line is
+    parsed exactly once.
+
+    Args:
+        file_path (str): The path to the JSON Lines input file.
+        start (int): The byte offset the slice starts at.
+        end (int): The byte offset the slice ends at (exclusive).
+
+    Yields:
+        Any: Each parsed record whose line starts inside the slice.
+    """
+    with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        # Each shard advises only its own range so one process's hints
+        # don't evict pages its neighbours are about to read.
+        advise_sequential(f, start, end - start)
+        if start:
+            # Step back one byte before discarding the partial line: if
+            # `start` already sits on a line start, only the preceding
+            # newline is consumed and the line is kept.
+            f.seek(start - 1)
+            f.readline()
+        else:
+            f.seek(0)
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            if not line.isspace():
+                yield orjson.loads(line)
+        advise_done(f, start, end - start)
+
+
+def byte_ranges(file_path: str, count: int) -> List[Any]:
+    """
+    Splits the file into `count` contiguous byte ranges of similar size.
+
+    Args:
+        file_path (str): The path to the file to split.
+        count (int): The number of ranges to produce.
+
+    Returns:
+        List[Any]: (start, end) tuples covering the whole file.
+    """
+    size = os.path.getsize(file_path)
+    offsets = [size * i // count for i in range(count)] + [size]
+    return [(offsets[i], offsets[i + 1]) for i in range(count)]
+
+
+# Bytes that can change JSON structural state. Everything between them is
+# skipped inside the C regex engine during the array boundary pre-pass.
+STRUCTURAL_BYTES = re.compile(rb'[",\\\[\]{}]')
+
+
+def array_byte_ranges(file_path: str, count: int) -> List[Any]:
+    """
+    Splits a JSON array file into `count` ranges at element boundaries.
+
+    Unlike JSON Lines, an array has no free delimiters, so a sequential
+    pre-pass tracks string/escape state and bracket depth and records
+    the first top-level comma past each arithmetic target offset. Only
+    structural bytes reach Python — the stretches between them are
+    skipped by the regex engine — which keeps the scan far cheaper than
+    a real parse. The returned ranges cover element content only; the
+    enclosing brackets and the chosen commas are excluded.
+
+    Args:
+        file_path (str): The path to the JSON array input file.
+        count (int): The number of ranges to aim for.
+
+    Returns:
+        List[Any]: (start, end) tuples, one per slice of the array.
+    """
+    size = os.path.getsize(file_path)
+    targets = [size * i // count for i in range(1, count)]
+    splits: List[int] = []
+    content_start = -1
+    content_end = -1
+    depth = 0
+    in_string = False
+    escape_pos = -1  # Absolute position an escape applies to, or -1
+    offset = 0
+    with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        advise_sequential(f)
+        while True:
+            chunk = f.read(SCAN_CHUNK_SIZE)
+            if not chunk:
+                break
+            for match in STRUCTURAL_BYTES.finditer(chunk):
+                pos = offset + match.start()
+                byte = match.group()
+                if in_string:
+                    if byte == b'\\':
+                        # A backslash escapes the next byte unless it is
+                        # itself escaped.
+                        escape_pos = pos + 1 if escape_pos != pos else -1
+                    elif byte == b'"' and escape_pos != pos:
+                        in_string = False
+                    continue
+                if byte == b'"':
+                    in_string = True
+                elif byte in (b'{', b'['):
+                    depth += 1
+                    if depth == 1:
+                        content_start = pos + 1
+                elif byte in (b'}', b']'):
+                    depth -= 1
+                    if depth == 0:
+                        content_end = pos
+                elif byte == b',' and depth == 1:
+                    if targets and pos >= targets[0]:
+                        splits.append(pos)
+                        while targets and pos >= targets[0]:
+                            targets.pop(0)
+            offset += len(chunk)
+        advise_done(f)
+    if content_start < 0 or content_end <= content_start:
+        return []
+    starts = [content_start] + [s + 1 for s in splits]
+    ends = splits + [content_end]
+    return list(zip(starts, ends))
+
+
+class ArraySliceFile:
+    """
+    Read-only file-like view presenting a byte range as a JSON array.
+
+    Wraps the element content between two split points in '[' and ']'
+    so ijson can stream it as a complete document without the slice
+    ever being copied into memory.
+    """
+
+    def __init__(self, f: Any, start: int, end: int):
+        self._f = f
+        self._f.seek(start)
+        self._remaining = end - start
+        self._buffer = b'['  # Bytes ready to serve ahead of the range
+        self._bracket_sent = False
+
+    def read(self, size: int = -1) -> bytes:
+        # ijson's C backend treats a short read as end of input, so fill
+        # the requested size for as long as bytes remain.
+        parts = [self._buffer]
+        have = len(self._buffer)
+        self._buffer = b''
+        while self._remaining > 0 and (size < 0 or have < size):
+            want = self._remaining if size < 0 else min(size - have, self._remaining)
+            chunk = self._f.read(want)
+            if not chunk:
+                self._remaining = 0
+                break
+            self._remaining -= len(chunk)
+            have += len(chunk)
+            parts.append(chunk)
+        if self._remaining == 0 and not self._bracket_sent:
+            parts.append(b']')
+            self._bracket_sent = True
+        out = b''.join(parts)
+        if 0 <= size < len(out):
+            out, self._buffer = out[:size], out[size:]
+        return out
+
+
+def iter_records_array_slice(file_path: str, start: int, end: int) -> Iterator[Any]:
+    """
+    Yields records from a byte range of a JSON array input file.
+
+    The range must cover whole elements, as produced by
+    `array_byte_ranges`; the slice is re-wrapped in brackets and
+    streamed with ijson exactly like the single-process array path.
+
+    Args:
+        file_path (str): The path to the JSON array input file.
+        start (int): The byte offset the slice starts at.
+        end (int): The byte offset the slice ends at (exclusive).
+
+    Yields:
+        Any: Each parsed element whose content lies inside the slice.
+    """
+    with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        advise_sequential(f, start, end - start)
+        yield from ijson_backend.items(ArraySliceFile(f, start, end), 'item', use_float=True, buf_size=IJSON_BUF_SIZE)
+        advise_done(f, start, end - start)
+
+
+def project_records(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Projects every record in the batch down to PROJECT_FIELDS.
+
+    Pruning the large unused fields (arXiv abstracts and version
+    histories dominate record size) cuts payload bytes and server-side
+    work proportionally. The C-implemented itemgetter handles the whole
+    batch; records missing a field fall back to a .get() projection.
+
+    Args:
+        batch (List[Dict[str, Any]]): The records to project.
+
+    Returns:
+        List[Dict[str, Any]]: New records holding only the kept fields.
+    """
+    if len(PROJECT_FIELDS) > 1:
+        getter = operator.itemgetter(*PROJECT_FIELDS)
+        try:
+            return [dict(zip(PROJECT_FIELDS, getter(r))) for r in batch]
+        except KeyError:
+            pass
+    return [{k: r.get(k) for k in PROJECT_FIELDS} for r in batch]
+
+
+def batch_records(records: Iterator[Any], batch_size: int = BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Groups a stream of records into batches.
+
+    Only one batch is ever held per worker, so peak memory is
+    O(batch_size * workers) instead of O(file_size).
+
+    Args:
+        records (Iterator[Any]): The stream of parsed records.
+        batch_size (int): The number of records per batch.
+
+    Yields:
+        List[Dict[str, Any]]: Successive batches of at most `batch_size` records.
+    """
+    # Validation is a single sample check on the first record: a stream
+    # that starts with an object is overwhelmingly an object stream. A
+    # later malformed record fails its batch — run_query raises on the
+    # ERR statuses the server returns — which only costs a fallback to
+    # the individual insert path, and that path does validate.
+    records = iter(records)
+    try:
+        first = next(records)
+    except StopIteration:
+        return
+    if type(first) is not dict:
+        log.warning("First record is a %s, not an object; expect batch fallbacks.", type(first).__name__)
+    # One slot buffer is pre-allocated and overwritten in place; each
+    # flush hands out a right-sized copy, so the loop never grows a list
+    # incrementally and each batch costs exactly one allocation.
+    project = project_records if PROJECT_FIELDS else None
+    buf = [None] * batch_size
+    buf[0] = first
+    idx = 1
+    for record in records:
+        buf[idx] = record
+        idx += 1
+        if idx == batch_size:
+            yield project(buf) if project else buf[:]
+            idx = 0
+    if idx:
+        yield project(buf[:idx]) if project else buf[:idx]
+
+
+def stream_batches(file_path: str, batch_size: int = BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Streams records from disk and yields them in batches.
+
+    Args:
+        file_path (str): The path to the input file (JSON array or JSON Lines).
+        batch_size (int): The number of records per batch.
+
+    Yields:
+        List[Dict[str, Any]]: Successive batches of at most `batch_size` records.
+    """
+    yield from batch_records(iter_records(file_path), batch_size)
+
+
+def build_batch_query(table_name: str, batch: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Builds a transaction-wrapped, idempotent query inserting the batch.
+
+    The batch is bound as a single $records array parameter, so the
+    statement text is constant and the server parses one INSERT per
+    batch instead of one CREATE per record. Wrapping it in BEGIN/COMMIT
+    lets SurrealDB batch the writes internally, which is much faster
+    than the same statements issued independently. Note that a record
+    skipped as a pre-existing duplicate is indistinguishable from an
+    inserted one in the tally.
+
+    Args:
+        table_name (str): The name of the table to insert into.
+        batch (List[Dict[str, Any]]): The records to insert.
+
+    Returns:
+        (str, Dict[str, Any]): The query string and its bound parameters.
+    """
+    # The batch is bound by reference: neither this function nor the
+    # driver copies the record dicts (the driver CBOR-encodes them in
+    # place), so each record is allocated exactly once, by the parser.
+    # Records carrying an 'id' field keep it as their record id (arXiv
+    # metadata does), which makes inserts deterministic; IGNORE then
+    # makes re-runs idempotent — rows that already exist are skipped
+    # server-side instead of failing the whole transaction, so an
+    # interrupted import can simply be restarted.
+    query = f"BEGIN TRANSACTION; INSERT IGNORE INTO {table_name} $records; COMMIT TRANSACTION;"
+    return query, {"records": batch}
+
+
+class QueryError(Exception):
+    """A statement inside a submitted query returned status ERR."""
+
+
+async def run_query(db: Any, query: str, params: Dict[str, Any] = None) -> List[Any]:
     """
-    Inserts a single record into the database.
+    Runs a query, raising QueryError if any statement failed.
+
+    The pinned driver's `query` hands back the first statement's
+    payload without inspecting per-statement status, so an INSERT that
+    aborts inside BEGIN/COMMIT comes back indistinguishable from
+    success. Submit through `query_raw` and check every statement, so
+    callers' failure handling (retries, bisection, per-record fallback)
+    actually sees the error instead of over-counting inserts.
+
+    Args:
+        db (Any): An open, authenticated SurrealDB connection.
+        query (str): The SurrealQL to run.
+        params (Dict[str, Any]): Parameters bound to the query.
+
+    Returns:
+        List[Any]: The result payload of each statement, in order.
+    """
+    response = await db.query_raw(query, params or {})
+    error = response.get("error")
+    if error is not None:
+        raise QueryError(str(error))
+    statements = response.get("result") or []
+    failures = [str(s.get("result")) for s in statements
+                if isinstance(s, dict) and s.get("status") == "ERR"]
+    if failures:
+        # Inside an aborted transaction every other statement reports the
+        # generic "not executed" message; surface the root cause instead.
+        specific = [f for f in failures if "not executed" not in f]
+        raise QueryError(specific[0] if specific else failures[0])
+    return [s.get("result") if isinstance(s, dict) else s for s in statements]
+
+
+async def open_connection(database_url: str, namespace: str, database: str) -> Any:
+    """
+    Opens one pre-authenticated SurrealDB connection.
+
+    signin and use run exactly once here — at connection open — so the
+    insert loop pays no per-call handshake cost, and every reconnect
+    goes through this function and repeats both (skipping `use` on a
+    fresh socket would silently target the wrong namespace).
 
     Args:
         database_url (str): The URL of the SurrealDB instance.
         namespace (str): The namespace to use in SurrealDB.
         database (str): The database to use in SurrealDB.
-        table_name (str): The name of the table to insert into.
-        record (Dict[str, Any]): The record to insert.
-        record_number (int): The record number for logging.
 
     Returns:
-        bool: True if the insertion was successful, False otherwise.
+        Any: The opened connection.
+    """
+    db = AsyncSurreal(database_url)
+    await db.signin({"username": "root", "password": "root"})
+    await db.use(namespace, database)
+    return db
+
+
+async def suspend_indexes(db: Any, table_name: str) -> List[str]:
+    """
+    Drops the table's secondary indexes, returning their definitions.
+
+    SurrealDB maintains indexes incrementally, so every bulk insert
+    pays B-tree update cost per indexed field. Removing indexes for the
+    duration of the import and rebuilding them afterwards in one pass
+    is the classic bulk-load trade and is usually several times faster
+    overall. A missing table (first import) simply yields no indexes.
+
+    Args:
+        db (Any): An open connection.
+        table_name (str): The table whose indexes should be suspended.
+
+    Returns:
+        List[str]: The DEFINE INDEX statements needed to rebuild them.
     """
     try:
-        with Surreal(database_url) as db:
-            log.debug(f"[Record {record_number}] Connecting to SurrealDB...")
-            db.signin({"username": "root", "password": "root"})
-            log.debug(f"[Record {record_number}] Authentication successful.")
-            db.use(namespace, database)
-            log.debug(f"[Record {record_number}] Using namespace '{namespace}' and database '{database}'.")
-
-            if not isinstance(record, dict):
-                log.warning(f"[Record {record_number}] Skipping: Item is not a dictionary. Type: {type(record)}")
-                return False
-
-            log.debug(f"[Record {record_number}] Attempting to insert...")
-            created = db.create(table_name, record)
-
-            if created:
-                return True
+        info = await db.query(f"INFO FOR TABLE {table_name}")
+    except CONNECTION_ERRORS:
+        raise
+    except Exception:
+        return []  # Table does not exist yet; nothing to suspend
+    if not isinstance(info, dict):
+        return []
+    indexes = info.get('indexes') or {}
+    definitions = []
+    for name, definition in indexes.items():
+        # Only remove what can provably be rebuilt: an index whose INFO
+        # entry is not a DEFINE statement string keeps paying insert
+        # cost rather than being dropped with no way back.
+        if not isinstance(definition, str):
+            log.warning("Index %s on %s has a non-string definition; leaving it in place", name, table_name)
+            continue
+        definitions.append(definition)
+        await db.query(f"REMOVE INDEX {name} ON TABLE {table_name}")
+    if definitions:
+        log.info("Suspended %d secondary indexes on %s for the import", len(definitions), table_name)
+    return definitions
+
+
+async def restore_indexes(db: Any, definitions: List[str]):
+    """
+    Re-runs saved DEFINE INDEX statements after the bulk import.
+
+    The server builds each index in one sorted pass over the loaded
+    data, which is much cheaper than the incremental updates the
+    inserts would otherwise have paid.
+
+    Args:
+        db (Any): An open connection.
+        definitions (List[str]): DEFINE INDEX statements from
+            `suspend_indexes`.
+    """
+    for definition in definitions:
+        await run_query(db, definition)
+    if definitions:
+        log.info("Rebuilt %d secondary indexes", len(definitions))
+
+
+class SurrealPool:
+    """
+    A fixed-size pool of pre-authenticated SurrealDB connections.
+
+    Every connection is signed in and namespaced at open, so workers
+    check one out, run queries, and check it back in without paying any
+    handshake. A connection invalidated by a socket error is discarded
+    and lazily replaced on a later acquire.
+    """
+
+    def __init__(self, database_url: str, namespace: str, database: str, size: int):
+        self.database_url = database_url
+        self.namespace = namespace
+        self.database = database
+        self.size = size
+        self._connections: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self._discarded = 0  # Connections to lazily reopen after discards
+        self._heartbeat_task = None
+
+    async def open(self):
+        """Opens all pooled connections up front and starts the keepalive.
+
+        Connections are opened concurrently: each handshake is two
+        serial round-trips (signin, then use — the driver runs one
+        request in flight per socket), but across sockets they overlap,
+        so warmup costs roughly one handshake instead of `size`.
+        """
+        connections = await asyncio.gather(*(
+            open_connection(self.database_url, self.namespace, self.database)
+            for _ in range(self.size)
+        ))
+        for db in connections:
+            self._connections.put_nowait(db)
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        log.info("Opened %d pooled SurrealDB connections.", self.size)
+
+    async def _heartbeat(self):
+        """Pings idle connections so long gaps between batches cannot let
+        the server or a middlebox reap the sockets and force full
+        re-handshakes."""
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            for _ in range(self._connections.qsize()):
+                # The qsize() snapshot goes stale while a ping awaits —
+                # workers acquire concurrently — so an empty queue here
+                # just means no more idle connections this round.
+                try:
+                    db = self._connections.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                try:
+                    await db.version()  # Cheapest round-trip the RPC surface offers
+                    self._connections.put_nowait(db)
+                except Exception:
+                    await self.discard(db)
+
+    async def acquire(self) -> Any:
+        """Checks a live connection out of the pool, reopening a discarded one if needed."""
+        if self._connections.empty() and self._discarded > 0:
+            self._discarded -= 1
+            return await open_connection(self.database_url, self.namespace, self.database)
+        return await self._connections.get()
+
+    def release(self, db: Any):
+        """Returns a healthy connection to the pool."""
+        self._connections.put_nowait(db)
+
+    async def discard(self, db: Any):
+        """Closes a broken connection; a replacement is opened lazily on acquire."""
+        self._discarded += 1
+        try:
+            await db.close()
+        except Exception:
+            pass
+
+    async def close(self):
+        """Stops the keepalive and closes every pooled connection."""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+        while not self._connections.empty():
+            db = self._connections.get_nowait()
+            try:
+                await db.close()
+            except Exception:
+                pass
+
+
+async def insert_records_individually(db: Any, table_name: str, batch: List[Dict[str, Any]], batch_number: int) -> int:
+    """
+    Inserts a batch record-by-record over an already-open connection.
+
+    Used as a fallback when a whole-batch transaction fails, so one bad
+    record does not discard its batch. The connection is reused — there
+    is no per-record connect or signin.
+
+    Args:
+        db (Any): An open, authenticated SurrealDB connection.
+        table_name (str): The name of the table to insert into.
+        batch (List[Dict[str, Any]]): The records to insert.
+        batch_number (int): The batch number for logging.
+
+    Returns:
+        int: The number of records successfully inserted.
+    """
+    inserted = 0
+    for record in batch:
+        # Exact type check: the parsers only ever produce plain dicts,
+        # so there is no MRO to walk — `type is` is the cheaper test.
+        if type(record) is not dict:
+            log.warning("[Batch %d] Skipping non-dictionary record of type %s.", batch_number, type(record).__name__)
+            continue
+        try:
+            await db.create(table_name, record)
+            inserted += 1
+        except CONNECTION_ERRORS:
+            raise  # Let the worker reconnect; a dead socket fails everything
+        except Exception as e:
+            # The driver raises bare Exception for every server error,
+            # so classify by message: duplicates stay a cheap WARNING
+            # with no record repr.
+            message = str(e)
+            if "already exists" in message:
+                log.warning("[Batch %d] Duplicate detected: %s", batch_number, message)
             else:
-                log.error(f"[Record {record_number}] Failed: db.create did not return success. Snippet: {str(record)[:200]}...")
-                return False
-    except Exception as e:
-        error_message = str(e)
-        if "already exists" in error_message:
-            log.warning(f"[Record {record_number}] Duplicate detected: {error_message}")
-            return False  # Treat duplicates as failed inserts but continue
-        else:
-            log.error(f"[Record {record_number}] Error: {e}", exc_info=True)
-            log.debug(f"[Record {record_number}] Problematic record snippet: {str(record)[:200]}...")
-            return False
+                log.error("[Batch %d] Record error: %s — %s", batch_number, message, RECORD_REPR.repr(record))
+    return inserted
+
+
+async def insert_batch(db: Any, table_name: str, batch: List[Dict[str, Any]], batch_number: int, retries: int = MAX_INSERT_RETRIES) -> int:
+    """
+    Inserts a batch of records over an already-open connection.
+
+    Server-side failures surface as QueryError from run_query — the
+    driver itself only raises for dead sockets, which propagate to the
+    pool instead. A failed batch is retried with jittered exponential
+    backoff first — under burst load the server can reject or time out
+    transiently, and a short pause recovers those without losing
+    batch-mode speed. Only
+    after the retries are exhausted is the failure treated as
+    deterministic: the batch is bisected and each half retried, so a
+    single bad record costs O(log batch_size) extra round-trips to
+    isolate instead of demoting the whole batch to per-record inserts.
+
+    Args:
+        db (Any): An open, authenticated SurrealDB connection.
+        table_name (str): The name of the table to insert into.
+        batch (List[Dict[str, Any]]): The records to insert.
+        batch_number (int): The batch number for logging.
+        retries (int): Attempts before falling back; the bisection
+            halves pass 1 since transience has already been ruled out.
+
+    Returns:
+        int: The number of records successfully inserted.
+    """
+    query, params = build_batch_query(table_name, batch)
+    last_error = None
+    for attempt in range(retries):
+        if attempt:
+            delay = 0.1 * (1 << (attempt - 1)) + random.random() * 0.05
+            log.warning("[Batch %d] Insert failed (%s); retrying in %.2fs.", batch_number, last_error, delay)
+            await asyncio.sleep(delay)
+        try:
+            await run_query(db, query, params)
+            return len(batch)
+        except CONNECTION_ERRORS:
+            raise  # Let the worker reconnect and retry the batch
+        except Exception as e:
+            last_error = e
+    if len(batch) > MIN_SPLIT_SIZE:
+        log.warning("[Batch %d] Batch of %d failed (%s); splitting.", batch_number, len(batch), last_error)
+        mid = len(batch) // 2
+        return (await insert_batch(db, table_name, batch[:mid], batch_number, retries=1)
+                + await insert_batch(db, table_name, batch[mid:], batch_number, retries=1))
+    log.warning("[Batch %d] Batch failed (%s); retrying records individually.", batch_number, last_error)
+    return await insert_records_individually(db, table_name, batch, batch_number)
+
+
+async def insert_batch_pooled(pool: SurrealPool, table_name: str, batch: List[Dict[str, Any]], batch_number: int) -> int:
+    """
+    Inserts a batch using a pooled connection, reconnecting on socket death.
+
+    Args:
+        pool (SurrealPool): The connection pool.
+        table_name (str): The name of the table to insert into.
+        batch (List[Dict[str, Any]]): The records to insert.
+        batch_number (int): The batch number for logging.
+
+    Returns:
+        int: The number of records successfully inserted.
+    """
+    db = await pool.acquire()
+    try:
+        inserted = await insert_batch(db, table_name, batch, batch_number)
+    except CONNECTION_ERRORS as e:
+        log.warning("[Batch %d] Connection lost (%s); reconnecting.", batch_number, e)
+        await pool.discard(db)
+        db = await pool.acquire()
+        try:
+            inserted = await insert_batch(db, table_name, batch, batch_number)
+        except CONNECTION_ERRORS as e:
+            log.error("[Batch %d] Still unreachable after reconnect: %s", batch_number, e)
+            await pool.discard(db)
+            return 0
+    pool.release(db)
+    return inserted
+
+
+async def batch_worker(pool: SurrealPool, queue: "asyncio.Queue", table_name: str, counts: Dict[str, int], progress: Progress, task: Any):
+    """
+    Consumes batches from the queue and inserts them via the pool.
+
+    Concurrency model: the client runs one request in flight per socket
+    (its send/recv are lockstep, so gathering several inserts on one
+    connection would interleave frames). Total in-flight inserts
+    therefore equal the pool size — raise POOL_SIZE to pipeline deeper.
+
+    Args:
+        pool (SurrealPool): The connection pool.
+        queue (asyncio.Queue): The queue of (batch_number, batch) items.
+        table_name (str): The name of the table to insert into.
+        counts (Dict[str, int]): Shared inserted/failed counters.
+        progress (Progress): The progress display, advanced once per batch.
+        task (Any): The progress task id.
+    """
+    update_progress = progress.update  # Hoisted; called once per batch
+    while True:
+        item = await queue.get()
+        if item is None:
+            queue.task_done()
+            break
+        batch_number, batch = item
+        inserted = await insert_batch_pooled(pool, table_name, batch, batch_number)
+        counts["inserted"] += inserted
+        counts["failed"] += len(batch) - inserted
+        update_progress(task, advance=len(batch))  # Description is static; no per-batch string build
+        queue.task_done()
 
 
-def process_records_in_parallel(database_url: str, namespace: str, database: str, table_name: str, records: List[Dict[str, Any]], max_workers: int = num_core):
+async def process_batches_in_parallel(database_url: str, namespace: str, database: str, table_name: str, batches: Iterator[List[Dict[str, Any]]], max_workers: int = num_core, show_progress: bool = True):
     """
-    Processes records in parallel using a thread pool.
+    Processes streamed batches concurrently over a pool of connections.
+
+    A bounded queue feeds one worker coroutine per pooled connection, so
+    the parser cannot outrun the database and every batch costs a single
+    round-trip on an already-authenticated socket.
 
     Args:
         database_url (str): The URL of the SurrealDB instance.
         namespace (str): The namespace to use in SurrealDB.
         database (str): The database to use in SurrealDB.
         table_name (str): The name of the table to insert into.
-        records (List[Dict[str, Any]]): The list of records to process.
-        max_workers (int): The maximum number of worker threads.
+        batches (Iterator[List[Dict[str, Any]]]): The stream of batches to insert.
+        max_workers (int): The number of pooled connections / workers.
+        show_progress (bool): Whether to render the progress bar (off in
+            sharded child processes, whose output would collide).
     """
-    log.info(f"Starting parallel processing with {max_workers} workers...")
-    inserted_count = 0
-    failed_count = 0
+    log.info("Starting parallel processing with %d workers and batch size %d...", max_workers, BATCH_SIZE)
+    counts = {"inserted": 0, "failed": 0}
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2 * max_workers)
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        TimeElapsedColumn(),
+        refresh_per_second=4,  # Cap redraws; updates arrive per batch, not per record
+        disable=not show_progress,
+    ) as progress:
+        task = progress.add_task(f"[cyan]Inserting into '{table_name}'...", total=None)
+        pool = SurrealPool(database_url, namespace, database, max_workers)
+        await pool.open()
+        workers = [
+            asyncio.create_task(batch_worker(pool, queue, table_name, counts, progress, task))
+            for _ in range(max_workers)
+        ]
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_record = {
-            executor.submit(insert_record, database_url, namespace, database, table_name, record, i + 1): record
-            for i, record in enumerate(records)
-        }
+        loop = asyncio.get_running_loop()
+
+        def produce():
+            # Runs in a thread so ijson/orjson parsing overlaps the
+            # workers' network round-trips instead of blocking the loop.
+            # run_coroutine_threadsafe(...).result() preserves the
+            # queue's backpressure from the thread side.
+            def put_from_thread(item) -> bool:
+                # Block with a timeout and re-check worker liveness: if
+                # every worker has exited (e.g. the server went away), a
+                # plain .result() on a full queue would never resolve and
+                # interpreter shutdown would hang joining the executor.
+                while True:
+                    future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+                    try:
+                        future.result(timeout=PRODUCER_POLL_INTERVAL)
+                        return True
+                    except concurrent.futures.TimeoutError:
+                        future.cancel()
+                        try:
+                            future.result()  # Won the race and completed anyway
+                            return True
+                        except (concurrent.futures.CancelledError, asyncio.CancelledError):
+                            pass
+                        if all(worker.done() for worker in workers):
+                            return False
 
-        for future in as_completed(future_to_record):
-            record = future_to_record[future]
             try:
-                if future.result():
-                    inserted_count += 1
-                    if inserted_count % LOG_EVERY_N_RECORDS == 0:
-                        log.info(f"[Progress] Inserted {inserted_count} records so far.")
-                else:
-                    failed_count += 1
-            except Exception as e:
-                log.error(f"[Record Processed] Unexpected error: {e}", exc_info=True)
-                failed_count += 1
+                for batch_number, batch in enumerate(batches, start=1):
+                    if not put_from_thread((batch_number, batch)):
+                        log.error("All insert workers exited; abandoning the remaining input.")
+                        break
+            finally:
+                for _ in range(len(workers)):
+                    if not put_from_thread(None):
+                        break
+
+        try:
+            await asyncio.gather(loop.run_in_executor(None, produce), *workers)
+        finally:
+            await pool.close()
 
-    log.info(f"[bold green]Parallel processing complete.[/bold green] Inserted: {inserted_count}, Failed: {failed_count}")
+    log.info("Parallel processing complete. Inserted: %d, Failed: %d", counts["inserted"], counts["failed"])
 
 
-def load_and_insert_data(file_path: str, database_url: str, namespace: str, database: str):
+def import_slice(file_path: str, start: int, end: int, database_url: str, namespace: str, database: str, table_name: str, max_workers: int, is_array: bool = False):
     """
-    Loads data by streaming a JSON array using ijson, connects to SurrealDB,
-    and inserts the data with progress logging.
+    Entry point for one parser process importing a byte range.
+
+    Each process parses its own slice on its own core (no GIL sharing
+    with the other parsers) and inserts through its own connection pool.
+
+    Args:
+        file_path (str): The path to the input file.
+        start (int): The byte offset the slice starts at.
+        end (int): The byte offset the slice ends at (exclusive).
+        database_url (str): The URL of the SurrealDB instance.
+        namespace (str): The namespace to use in SurrealDB.
+        database (str): The database to use in SurrealDB.
+        table_name (str): The name of the table to insert into.
+        max_workers (int): The number of pooled connections for this process.
+        is_array (bool): True if the slice holds JSON array elements
+            rather than JSON Lines.
+    """
+    if uvloop is not None:
+        # Each shard runs its own event loop; make sure it is uvloop even
+        # when the parent was driven programmatically rather than via
+        # `python -m`, where the __main__ install never ran.
+        uvloop.install()
+    records = iter_records_array_slice(file_path, start, end) if is_array else iter_records_slice(file_path, start, end)
+    batches = batch_records(records)
+    asyncio.run(process_batches_in_parallel(database_url, namespace, database, table_name, batches, max_workers=max_workers, show_progress=False))
+
+
+async def load_and_insert_data(file_path: str, database_url: str, namespace: str, database: str):
+    """
+    Loads data by streaming the input file, connects to SurrealDB,
+    and inserts the data in batches with progress logging.
 
     Args:
         file_path (str): The path to the large JSON file containing a single array.
@@ -118,41 +948,101 @@ def load_and_insert_data(file_path: str, database_url: str, namespace: str, data
         namespace (str): The namespace to use in SurrealDB.
         database (str): The database to use in SurrealDB.
     """
-    log.info(f"Attempting to stream JSON array from: [cyan]{file_path}[/cyan]")
+    log.info("Attempting to stream records from: %s", file_path)
 
     table_name = "arxiv_data"  # Use a consistent table name
 
     try:
-        # Open the file and stream items
-        log.info(f"Opening file: {file_path}")
         with open(file_path, 'rb') as f:
-            parser = ijson.items(f, 'item')  # 'item' targets each element in the array
-            records = list(parser)  # Load all records into memory for parallel processing
+            is_array = sniff_is_array(f)
 
-        log.info(f"Loaded {len(records)} records. Starting parallel processing...")
-        process_records_in_parallel(database_url, namespace, database, table_name, records, max_workers=num_core)
+        # Indexes are suspended for the duration of the bulk load and
+        # rebuilt in one pass at the end. The suspend connection is
+        # closed immediately — it would otherwise idle without keepalive
+        # for the whole import and likely be reaped before the rebuild.
+        admin = await open_connection(database_url, namespace, database)
+        try:
+            index_definitions = await suspend_indexes(admin, table_name)
+        finally:
+            await admin.close()
+        try:
+            ranges = []
+            if PARSE_PROCESSES > 1:
+                # JSON Lines splits cleanly on newlines; arrays need a
+                # structural pre-pass to find element boundaries first.
+                ranges = (array_byte_ranges if is_array else byte_ranges)(file_path, PARSE_PROCESSES)
+
+            if len(ranges) > 1:
+                workers_each = max(1, num_core // PARSE_PROCESSES)
+                log.info("Sharding across %d parser processes with %d connections each...", len(ranges), workers_each)
+                processes = [
+                    multiprocessing.Process(
+                        target=import_slice,
+                        args=(file_path, start, end, database_url, namespace, database, table_name, workers_each, is_array),
+                    )
+                    for start, end in ranges
+                ]
+                for p in processes:
+                    p.start()
+                for p in processes:
+                    p.join()
+                # A crash confined to one shard (e.g. a malformed line in
+                # its byte range) must not be reported as a clean run.
+                failed_shards = sum(1 for p in processes if p.exitcode != 0)
+                if failed_shards:
+                    log.critical("%d of %d parser shards exited with errors; the import is incomplete.", failed_shards, len(processes))
+            else:
+                batches = stream_batches(file_path, BATCH_SIZE)
+                await process_batches_in_parallel(database_url, namespace, database, table_name, batches, max_workers=num_core)
+        finally:
+            # Rebuild even after a failed import — otherwise a retry
+            # would find nothing to suspend and the indexes would be
+            # silently lost. A fresh connection is opened for this: the
+            # definitions exist only in memory here, so the rebuild must
+            # not depend on a socket that sat idle for hours.
+            if index_definitions:
+                try:
+                    rebuild_db = await open_connection(database_url, namespace, database)
+                    try:
+                        await restore_indexes(rebuild_db, index_definitions)
+                    finally:
+                        try:
+                            await rebuild_db.close()
+                        except Exception:
+                            pass
+                except Exception as e:
+                    log.error("Index rebuild failed (%s). Re-run these statements manually:", e)
+                    for definition in index_definitions:
+                        log.error("    %s", definition)
 
     except FileNotFoundError:
-        log.critical(f"File not found: {file_path}")
+        log.critical("File not found: %s", file_path)
     except ijson.JSONError as e:
-        log.critical(f"JSON parsing error: {e}", exc_info=True)
+        log.critical("JSON parsing error: %s", e, exc_info=True)
     except Exception as e:
-        log.critical(f"An unexpected error occurred: {e}", exc_info=True)
+        log.critical("An unexpected error occurred: %s", e, exc_info=True)
 
 
-def main():
+async def main():
     """
     Main function to set parameters and call the data loading and insertion function.
+
+    Parameters can be overridden from the environment. SURREAL_URL
+    accepts ws:// or http:// schemes; the http transport avoids the
+    WebSocket's single-request-in-flight ordering per connection and can
+    ingest faster when the pool is large.
     """
-    file_path = 'arxiv_array_small.json'
-    database_url = 'ws://localhost:8000'
-    namespace = 'test'
-    database = 'test'
+    file_path = os.environ.get('IMPORT_FILE', 'arxiv_array_small.json')
+    database_url = os.environ.get('SURREAL_URL', 'ws://localhost:8000')
+    namespace = os.environ.get('SURREAL_NAMESPACE', 'test')
+    database = os.environ.get('SURREAL_DATABASE', 'test')
 
     log.info("Starting the data import process...")
-    load_and_insert_data(file_path, database_url, namespace, database)
+    await load_and_insert_data(file_path, database_url, namespace, database)
     log.info("Data import process completed.")
 
 
 if __name__ == "__main__":
-    main()  # Run main synchronously
+    if uvloop is not None:
+        uvloop.install()
+    asyncio.run(main())